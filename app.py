@@ -8,43 +8,104 @@ and stream logs from containers in real-time.
 Modules and Libraries:
 - os: For environment variable access.
 - argparse: For command-line argument parsing.
-- threading: For running log streaming in separate threads.
-- time: For simulating delays in test mode.
+- functools: For caching the cluster name.
+- gzip: For compressing the index page once at startup.
+- hashlib: For versioning static asset URLs by their content.
+- urllib.parse: For detecting versioned static asset requests.
+- threading: For pod watches and stopping log streams.
+- concurrent.futures: For the bounded pool of log streaming workers.
+- time: For log stream deadlines and reconnect timing.
 - asyncio: For asynchronous programming.
 - unittest.mock: For mocking Kubernetes API in test mode.
 - fastapi: For building the web application.
-- fastapi.responses: For HTML and JSON responses.
+- fastapi.responses: For HTML and JSON responses, serialized with orjson.
 - fastapi.staticfiles: For serving static files.
+- fastapi.middleware.gzip: For compressing responses.
+- starlette.datastructures: For reading and amending headers in the gzip middleware.
 - kubernetes: For interacting with Kubernetes API.
+- urllib3: For retrying failed Kubernetes API requests and detecting dropped log streams.
+- socket: For enabling TCP keepalive on Kubernetes API connections.
+- codecs: For decoding log streams chunk by chunk.
+- math: For computing the resume point of reconnected log streams.
+- orjson: For parsing raw Kubernetes API responses and encoding Socket.IO packets.
 - socketio: For WebSocket communication.
 - jinja2: For rendering HTML templates.
 - contextlib: For managing application lifespan.
+- collections: For keeping the recent lines of shared log streams.
 
 Global Variables:
 - MAIN_LOOP: Holds the main asyncio event loop for the application.
+- LOG_STREAM_POOL: Semaphore bounding the number of concurrent log streams.
+- LOG_STREAM_EXECUTOR: Thread pool running the blocking Kubernetes log reads.
+- LOG_STREAMS: Maps each (namespace, pod, container) to the StreamState following its logs.
+- ROOM_STREAMS: Maps the (sid, room) of each log window to the StreamState it views.
+- POD_CACHE: Maps each namespace to the `/pods` entry of each of its pods, kept current by a watch.
+- TEST_MODE: Whether mock Kubernetes data is served, read once from the environment.
+- POD_WATCHERS: Maps each namespace to the initial pod listing that starts its watch.
+- POD_REQUESTED_AT: Maps each watched namespace to the time of its last `/pods` request.
+- INDEX_HTML: The main index page, rendered once at startup.
+- INDEX_HTML_GZIP: The gzip-compressed main index page.
 
 FastAPI Endpoints:
-- `/`: Renders the main index page using Jinja2 templates.
+- `/`: Serves the main index page, prerendered from its Jinja2 template.
 - `/cluster-name`: Returns the name of the Kubernetes cluster.
-- `/pods/{namespace}`: Lists all pods in a given Kubernetes namespace along with their containers.
+- `/pods/{namespace}`: Lists all pods in a given Kubernetes namespace along with their containers,
+  served from POD_CACHE.
 
 Socket.IO Events:
 - `connect`: Handles client connection events.
 - `disconnect`: Handles client disconnection events.
 - `start`: Initializes a log streaming session for a specific container in a Kubernetes pod.
 - `stop`: Terminates a log streaming session for a specific container in a Kubernetes pod.
+- `log_batch` (emitted): A batch of log lines `l` for a pod `p` and container `c`, sent to the
+  socket of each subscribed room `r`. Keys are kept short as every batch carries them.
+  The next batch for a room is only sent once the browser has acknowledged this one.
 
 Functions:
 - `lifespan(app: FastAPI)`: Manages the application lifespan and sets the global MAIN_LOOP.
-- `stream_logs(sid, room, namespace, pod, container)`:
-  Streams logs from a Kubernetes container and emits them via WebSocket.
+- `start_pod_watch(namespace)`: Lists the pods of a namespace and starts watching them.
+- `watch_pods(namespace, resource_version)`: Applies pod events of a namespace to POD_CACHE.
+- `forget_pod_watch(namespace)`: Drops the cached pods of a namespace once its watch has stopped.
+- `forget_failed_listing(namespace, loading)`: Lets the next `/pods` request retry a failed listing.
+- `asset_url(path)`: Returns the URL of a static asset, versioned by its content.
+- `read_cluster_name()`: Reads the cluster name from the kubeconfig once and caches it.
+- `log_timestamp(line)`: Returns the timestamp of a log line in a form that sorts by time.
+- `queue_log_lines(stream, lines)`: Queues log lines without timestamps, skipping repeated ones.
+- `stream_logs(namespace, pod, container, stream)`:
+  Streams logs from a Kubernetes container into the queue of a LogStream; bound at startup
+  to `stream_pod_logs`, or to `stream_fake_logs` in test mode.
+- `emit_log_batches(state)`:
+  Drains the queued log lines of a stream and publishes them to its log windows.
+- `stream_logs_async(state)`:
+  Runs `stream_logs` as a cancellable task within the bounded log stream pool.
+- `stop_stream(sid, room)`: Unsubscribes a log window, stopping the stream once no window is left.
+
+Classes:
+- `LogStream`: Hands log lines from a worker thread to the event loop, and lets the loop stop it.
+- `LogViewer`: Sends a log window its batches, pacing them by the browser's acknowledgements.
+- `StreamState`: A log stream followed once and shared by every room viewing the same container.
+- `OrjsonSerializer`: Encodes and decodes Socket.IO packets with orjson.
+- `AssetFiles`: Serves static files, cached by browsers when requested by versioned URL.
 
 Kubernetes Client Setup:
 - In test mode (`TEST_MODE=true`), mock Kubernetes API responses are used.
+- Pods are read as raw JSON rather than deserialized into client models, and are
+  listed in gzip-compressed pages of POD_LIST_PAGE_SIZE pods.
 - In real mode, the Kubernetes client is configured using the kubeconfig file.
+  A single ApiClient, with a connection pool sized for all concurrent log streams
+  and retries on transient apiserver errors, is shared by every Kubernetes call.
+  Its connections use TCP keepalive so idle log streams are not dropped by load balancers.
 
 Static Files:
 - CSS and JS files are served from the `templates/css` and `templates/js` directories.
+- The index page links them by content-versioned URLs, which browsers cache indefinitely;
+  unversioned requests are revalidated with their ETag.
+- Responses of at least GZIP_MIN_SIZE bytes are gzip-compressed; the index page is
+  compressed once at startup instead.
+
+Server:
+- The app is served by a single Uvicorn worker using httptools, websockets and, where
+  available, uvloop.
 
 Command-Line Arguments:
 - `--port`: Specifies the port to run the application on
@@ -56,19 +117,83 @@ Run the application using the command:
 """
 import os
 import argparse
+import codecs
+import functools
+import gzip
+import hashlib
+import math
+import socket
 import threading
 import time
 import asyncio
+from collections import deque
+from concurrent.futures import CancelledError, ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from unittest.mock import MagicMock
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+from urllib.parse import parse_qs
+from fastapi import FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
-from kubernetes import client, config, watch
-from kubernetes.client import V1Pod, V1ObjectMeta, V1PodSpec, V1Container
+from starlette.datastructures import Headers, MutableHeaders
+import urllib3
+from urllib3.connection import HTTPConnection
+from urllib3.exceptions import HTTPError, ReadTimeoutError
+from kubernetes import client, config
+from kubernetes.client import V1ObjectMeta
+from kubernetes.watch.watch import iter_resp_lines
+import orjson
 import socketio
 from jinja2 import Environment, FileSystemLoader
-# pylint: disable=unused-argument
+# pylint: disable=unused-argument,too-many-lines
+
+# Log lines are emitted at most every LOG_BATCH_INTERVAL seconds, up to LOG_BATCH_SIZE per batch.
+LOG_BATCH_SIZE = 1000
+LOG_BATCH_INTERVAL = 0.05
+# Log lines queued per stream, and held back per log window while its browser hasn't acknowledged
+# the previous batch. On overflow the oldest lines are dropped, or with LOG_OVERFLOW=block the
+# stream is paused until every window viewing it catches up.
+LOG_QUEUE_SIZE = 10_000
+LOG_OVERFLOW_BLOCK = os.getenv("LOG_OVERFLOW") == "block"
+# Serve mock Kubernetes data instead of talking to a cluster.
+TEST_MODE = os.getenv("TEST_MODE") == "true"
+# Maximum number of log streams followed at the same time; further streams wait for a slot.
+LOG_STREAM_WORKERS = 64
+# Connections kept to the apiserver; must cover every log stream plus regular API calls.
+K8S_CONNECTION_POOL_MAXSIZE = 128
+# Log streams dropped by the network are resumed, backing off exponentially between attempts.
+LOG_RECONNECT_MIN_DELAY = 1
+LOG_RECONNECT_MAX_DELAY = 30
+# Log streams are reopened once open for LOG_STREAM_LIFETIME seconds, or silent for
+# LOG_READ_TIMEOUT seconds, so a stale stream can't hold its worker and connection forever.
+LOG_STREAM_LIFETIME = 1800
+LOG_CONNECT_TIMEOUT = 5
+LOG_READ_TIMEOUT = 1800
+# Pod watches are restarted from the last seen resource version after this many seconds.
+POD_WATCH_TIMEOUT = 300
+# Pod watches of namespaces no /pods request has asked for in this many seconds are stopped.
+POD_WATCH_IDLE_TIMEOUT = 900
+# Pods are listed in pages of this size so only one page is held in memory at a time.
+POD_LIST_PAGE_SIZE = 500
+# Log streams are read in chunks of up to this many bytes.
+LOG_CHUNK_SIZE = 8192
+# Lines of history sent when a log window opens, including when it joins a shared stream.
+LOG_TAIL_LINES = 100
+# Static assets requested with a content version are cached by browsers for a year, others are
+# revalidated on each use. Responses of at least GZIP_MIN_SIZE bytes are gzip-compressed.
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+GZIP_MIN_SIZE = 1000
+# Largest WebSocket message accepted from a browser; clients only send small commands.
+WS_MAX_SIZE = 2 ** 20
+
+# Probe idle apiserver connections so load balancers don't silently reset long-lived log streams.
+K8S_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+] + ([
+    (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30),
+    (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10),
+    (socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 6)
+] if hasattr(socket, 'TCP_KEEPIDLE') else [])
 
 
 class AppState:
@@ -94,6 +219,71 @@ class AppState:
         return cls._main_loop
 
 
+class OrjsonSerializer:
+    """
+    JSON module for Socket.IO packets, encoding and decoding them with orjson.
+    """
+
+    @staticmethod
+    def dumps(obj, **kwargs):
+        """
+        Encode an object as JSON. orjson always encodes compactly, so options are ignored.
+        :param obj: The object to encode.
+        :return: The JSON string.
+        """
+        return orjson.dumps(obj).decode('utf-8')
+
+    @staticmethod
+    def loads(s):
+        """
+        Decode a JSON string or bytes.
+        :param s: The JSON to decode.
+        :return: The decoded object.
+        """
+        return orjson.loads(s)
+
+
+def accepts_gzip(accept_encoding):
+    """
+    Whether an Accept-Encoding header accepts gzip, going by the q-value of `gzip`, or else of `*`.
+    :param accept_encoding: The Accept-Encoding header of a request.
+    """
+    qualities = {}
+    for coding in accept_encoding.lower().split(','):
+        name, _, params = coding.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip()] = quality
+    return qualities.get('gzip', qualities.get('*', 0.0)) > 0
+
+
+class NegotiatingGZipMiddleware(GZipMiddleware):  # pylint: disable=too-few-public-methods
+    """
+    GZipMiddleware going by the q-values of Accept-Encoding, so `gzip;q=0` is not answered gzipped.
+    Responses to requests refusing gzip get `Vary: Accept-Encoding`, unless they already carry it.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or accepts_gzip(Headers(scope=scope).get("accept-encoding", "")):
+            await super().__call__(scope, receive, send)
+            return
+
+        async def send_with_vary(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                if "accept-encoding" not in headers.get("vary", "").lower():
+                    headers.add_vary_header("Accept-Encoding")
+            await send(message)
+
+        await self.app(scope, receive, send_with_vary)
+
+
 # --- Lifespan context manager ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -102,22 +292,64 @@ async def lifespan(app: FastAPI):
     """
     AppState.set_main_loop(asyncio.get_running_loop())
     yield
-    # (optional: add shutdown code here)
+    for state in list(LOG_STREAMS.values()):
+        state.task.cancel()
+    LOG_STREAM_EXECUTOR.shutdown(wait=False)
 
 # --- Setup FastAPI and Socket.IO ---
-sio = socketio.AsyncServer(async_mode='asgi', cors_allowed_origins="*")
-fastapi_app = FastAPI(lifespan=lifespan)
+sio = socketio.AsyncServer(async_mode='asgi', cors_allowed_origins="*", json=OrjsonSerializer)
+fastapi_app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 kube_dash = socketio.ASGIApp(sio, other_asgi_app=fastapi_app)
 
+# --- Bounded pool of log streams ---
+LOG_STREAM_POOL = asyncio.Semaphore(LOG_STREAM_WORKERS)
+LOG_STREAM_EXECUTOR = ThreadPoolExecutor(
+    max_workers=LOG_STREAM_WORKERS,
+    thread_name_prefix="log-stream"
+)
+LOG_STREAMS = {}
+ROOM_STREAMS = {}
+
+fastapi_app.add_middleware(NegotiatingGZipMiddleware, minimum_size=GZIP_MIN_SIZE)
+
+
+def asset_url(path):
+    """
+    Returns the URL of a static asset, versioned by a hash of its content.
+    :param path: The path of the asset within the templates directory, e.g. `js/app.js`.
+    :return: The versioned URL of the asset.
+    """
+    with open(os.path.join("templates", path), "rb") as f:
+        version = hashlib.sha256(f.read()).hexdigest()[:12]
+    return f"/assets/{path}?v={version}"
+
+
+class AssetFiles(StaticFiles):
+    """
+    Serves static assets, letting browsers cache the ones requested by versioned URL.
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        versioned = "v" in parse_qs(scope["query_string"].decode("latin-1"))
+        response.headers["Cache-Control"] = ASSET_CACHE_CONTROL if versioned else "no-cache"
+        return response
+
+
 # --- Jinja2 for HTML templates ---
 env = Environment(loader=FileSystemLoader('templates'))
+env.globals["asset_url"] = asset_url
+# The index page takes no context, so it is rendered once at startup
+INDEX_HTML = env.get_template("index.html").render().encode("utf-8")
+# Compressed once as well, rather than by GZipMiddleware on every request
+INDEX_HTML_GZIP = gzip.compress(INDEX_HTML)
 
 # --- Mount static directories for CSS and JS ---
-fastapi_app.mount("/assets/css", StaticFiles(directory="templates/css"), name="css")
-fastapi_app.mount("/assets/js", StaticFiles(directory="templates/js"), name="js")
+fastapi_app.mount("/assets/css", AssetFiles(directory="templates/css"), name="css")
+fastapi_app.mount("/assets/js", AssetFiles(directory="templates/js"), name="js")
 
 # --- Kubernetes client setup (mock/test mode or real) ---
-if os.getenv("TEST_MODE") == "true":
+if TEST_MODE:
     v1 = MagicMock()
     # Mock namespaces
     mock_namespaces = [
@@ -128,49 +360,200 @@ if os.getenv("TEST_MODE") == "true":
     ]
     v1.list_namespace = MagicMock(return_value=MagicMock(items=mock_namespaces))
 
-    # Create mock pods
-    pod_1 = V1Pod(
-        metadata=V1ObjectMeta(name="pod-1"),
-        spec=V1PodSpec(
-            containers=[V1Container(name="container-1"), V1Container(name="container-2")],
-            init_containers=[]
-        )
-    )
-    pod_2 = V1Pod(
-        metadata=V1ObjectMeta(name="pod-2"),
-        spec=V1PodSpec(
-            containers=[V1Container(name="container-3"), V1Container(name="container-4")],
-            init_containers=[]
-        )
-    )
-    pod_3 = V1Pod(
-        metadata=V1ObjectMeta(name="pod-3"),
-        spec=V1PodSpec(
-            containers=[V1Container(name="container-5"), V1Container(name="container-6")],
-            init_containers=[]
-        )
-    )
-    pod_4 = V1Pod(
-        metadata=V1ObjectMeta(name="pod-4"),
-        spec=V1PodSpec(
-            containers=[V1Container(name="container-7"), V1Container(name="container-8")],
-            init_containers=[]
-        )
+    # Create mock pods, as raw JSON since pods are read with _preload_content=False
+    mock_pods = [
+        {
+            'metadata': {'name': f"pod-{i}"},
+            'spec': {'containers': [{'name': f"container-{c}"} for c in (2 * i - 1, 2 * i)]}
+        }
+        for i in range(1, 5)
+    ]
+    v1.list_namespaced_pod = MagicMock(
+        return_value=MagicMock(data=orjson.dumps({'metadata': {}, 'items': mock_pods}))
     )
-    v1.list_namespaced_pod = MagicMock(return_value=MagicMock(items=[pod_1, pod_2, pod_3, pod_4]))
 else:
     config.load_kube_config()
-    v1 = client.CoreV1Api()
+    kube_config = client.Configuration.get_default_copy()
+    kube_config.connection_pool_maxsize = K8S_CONNECTION_POOL_MAXSIZE
+    kube_config.retries = urllib3.Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=[502, 503, 504],
+        # Once retries are exhausted the response is returned, so the client raises ApiException
+        raise_on_status=False
+    )
+    client.Configuration.set_default(kube_config)
+    # Every Kubernetes call, including log streams in worker threads, goes through this client
+    api_client = client.ApiClient(kube_config)
+    # The client has no socket options setting, so hand them to the pools its PoolManager creates
+    api_client.rest_client.pool_manager.connection_pool_kw['socket_options'] = K8S_SOCKET_OPTIONS
+    # Let the apiserver compress large responses such as pod listings; urllib3 decodes them
+    api_client.set_default_header('Accept-Encoding', 'gzip')
+    v1 = client.CoreV1Api(api_client)
+
+
+# --- Pod cache, kept in sync with the cluster by one watch per namespace ---
+POD_CACHE = {}
+POD_CACHE_LOCK = threading.Lock()
+POD_WATCHERS = {}
+POD_REQUESTED_AT = {}
+
+
+def pod_entry(pod):
+    """
+    Build the `/pods` entry of a pod: its name and the names of its containers and init containers.
+    :param pod: The pod to describe, as a raw JSON object.
+    """
+    spec = pod['spec']
+    return {
+        'pod': pod['metadata']['name'],
+        'containers': [c['name'] for c in spec.get('containers', ())]
+        + [c['name'] for c in spec.get('initContainers', ())]
+    }
+
+
+def list_pods_into_cache(namespace):
+    """
+    List the pods of a namespace into POD_CACHE, one page of POD_LIST_PAGE_SIZE pods at a time.
+    :param namespace: The namespace to list.
+    :return: The resource version of the listing, to start watching from.
+    """
+    pods = {}
+    continue_token = None
+    while True:
+        # Parse the raw response, only the fields pod_entry needs are ever looked at
+        resp = v1.list_namespaced_pod(
+            namespace=namespace,
+            limit=POD_LIST_PAGE_SIZE,
+            _continue=continue_token,
+            _preload_content=False
+        )
+        try:
+            page = orjson.loads(resp.data)
+        finally:
+            resp.release_conn()
+        for pod in page['items']:
+            pods[pod['metadata']['name']] = pod_entry(pod)
+        continue_token = page['metadata'].get('continue')
+        if not continue_token:
+            break
+    with POD_CACHE_LOCK:
+        POD_CACHE[namespace] = pods
+    return page['metadata'].get('resourceVersion')
+
+
+def start_pod_watch(namespace):
+    """
+    Fill POD_CACHE for a namespace and start the thread that keeps it up to date.
+    :param namespace: The namespace to watch.
+    """
+    resource_version = list_pods_into_cache(namespace)
+    if TEST_MODE:
+        return
+    threading.Thread(
+        target=watch_pods,
+        args=(namespace, resource_version),
+        name=f"pod-watch-{namespace}",
+        daemon=True
+    ).start()
+
+
+def watch_pods(namespace, resource_version):
+    """
+    Apply the pod events of a namespace to POD_CACHE, starting from resource_version.
+    Events are parsed from the raw watch response. The watch is restarted from the last
+    event or bookmark seen, and the pods are listed again if that resource version has expired.
+    The watch stops once the namespace has not been requested for POD_WATCH_IDLE_TIMEOUT seconds.
+    """
+    delay = LOG_RECONNECT_MIN_DELAY
+    while time.monotonic() - POD_REQUESTED_AT.get(namespace, 0) < POD_WATCH_IDLE_TIMEOUT:
+        try:
+            if resource_version is None:
+                resource_version = list_pods_into_cache(namespace)
+            resp = v1.list_namespaced_pod(
+                namespace=namespace,
+                watch=True,
+                resource_version=resource_version,
+                allow_watch_bookmarks=True,
+                timeout_seconds=POD_WATCH_TIMEOUT,
+                _preload_content=False
+            )
+            try:
+                for line in iter_resp_lines(resp):
+                    event = orjson.loads(line)
+                    pod = event['object']
+                    if event['type'] == 'ERROR':
+                        raise client.exceptions.ApiException(
+                            status=pod.get('code'),
+                            reason=pod.get('message')
+                        )
+                    resource_version = pod['metadata']['resourceVersion']
+                    if event['type'] in ('ADDED', 'MODIFIED'):
+                        with POD_CACHE_LOCK:
+                            POD_CACHE[namespace][pod['metadata']['name']] = pod_entry(pod)
+                    elif event['type'] == 'DELETED':
+                        with POD_CACHE_LOCK:
+                            POD_CACHE[namespace].pop(pod['metadata']['name'], None)
+            finally:
+                resp.close()
+                resp.release_conn()
+            delay = LOG_RECONNECT_MIN_DELAY
+        except client.exceptions.ApiException as e:
+            if e.status == 410:
+                # Resource version too old, start over from a fresh listing
+                resource_version = None
+                continue
+            print(f"API error watching pods in {namespace}: {e}")
+            time.sleep(delay)
+            delay = min(delay * 2, LOG_RECONNECT_MAX_DELAY)
+        except HTTPError as e:
+            print(f"Connection lost watching pods in {namespace}, reconnecting in {delay}s: {e}")
+            time.sleep(delay)
+            delay = min(delay * 2, LOG_RECONNECT_MAX_DELAY)
+        except (orjson.JSONDecodeError, KeyError, TypeError) as e:
+            # An event may have been missed, so start over from a fresh listing
+            print(f"Unexpected pod event in {namespace}, listing again in {delay}s: {e!r}")
+            resource_version = None
+            time.sleep(delay)
+            delay = min(delay * 2, LOG_RECONNECT_MAX_DELAY)
+    AppState.get_main_loop().call_soon_threadsafe(forget_pod_watch, namespace)
+
+
+def forget_pod_watch(namespace):
+    """
+    Drop the cached pods of a namespace whose watch has stopped, so the next request
+    lists them again.
+    :param namespace: The namespace that was watched.
+    """
+    POD_WATCHERS.pop(namespace, None)
+    POD_REQUESTED_AT.pop(namespace, None)
+    with POD_CACHE_LOCK:
+        POD_CACHE.pop(namespace, None)
 
 
 # --- FastAPI Endpoints ---
 @fastapi_app.get("/", response_class=HTMLResponse)
-async def index():
+async def index(request: Request):
+    """
+    Serves the prerendered main index page.
     """
-    Renders the main index page.
+    if accepts_gzip(request.headers.get("accept-encoding", "")):
+        return HTMLResponse(
+            content=INDEX_HTML_GZIP,
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+        )
+    return HTMLResponse(content=INDEX_HTML, headers={"Vary": "Accept-Encoding"})
+
+
+@functools.lru_cache(maxsize=1)
+def read_cluster_name():
     """
-    template = env.get_template("index.html")
-    return HTMLResponse(template.render())
+    Reads the cluster name of the active kubeconfig context.
+    The kubeconfig does not change while the app runs, so it is only parsed once;
+    a failed read raises ConfigException, which is not cached, so it is retried next time.
+    """
+    _, active_context = config.list_kube_config_contexts()
+    return active_context.get('context', {}).get('cluster', 'Unknown Cluster')
 
 
 @fastapi_app.get("/cluster-name")
@@ -178,15 +561,13 @@ async def get_cluster_name():
     """
     Returns the name of the Kubernetes cluster.
     """
-    if os.getenv("TEST_MODE") == "true":
+    if TEST_MODE:
         return "Mock Cluster"
     try:
-        _, active_context = config.list_kube_config_contexts()
-        cluster_name = active_context.get('context', {}).get('cluster', 'Unknown Cluster')
+        return read_cluster_name()
     except config.ConfigException as e:
         print(f"Error retrieving cluster name: {e}")
-        cluster_name = "Unknown Cluster"
-    return cluster_name
+        return "Unknown Cluster"
 
 
 @fastapi_app.get("/namespaces")
@@ -194,7 +575,7 @@ async def list_namespaces():
     """
     List all available namespaces in the Kubernetes cluster.
     """
-    if os.getenv("TEST_MODE") == "true":
+    if TEST_MODE:
         # Return mock namespaces in test mode
         return ["default", "kube-system", "mock-namespace-1", "mock-namespace-2"]
 
@@ -206,67 +587,467 @@ async def list_namespaces():
         return []
 
 
+def forget_failed_listing(namespace, loading):
+    """
+    Drop a failed initial pod listing from POD_WATCHERS, so the next request retries it.
+    :param namespace: The namespace that was listed.
+    :param loading: The finished listing.
+    """
+    if loading.cancelled() or loading.exception() is not None:
+        if POD_WATCHERS.get(namespace) is loading:
+            del POD_WATCHERS[namespace]
+
+
 @fastapi_app.get("/pods/{namespace}")
 async def list_pods(namespace: str):
     """
     List all pods in a given Kubernetes namespace along with their containers.
+    The first request for a namespace lists its pods and starts watching them;
+    later requests are served from POD_CACHE.
     """
-    pods = v1.list_namespaced_pod(namespace=namespace).items
-    result = []
-    for pod in pods:
-        containers = []
-        if pod.spec.containers:
-            containers += [c.name for c in pod.spec.containers]
-        if pod.spec.init_containers:
-            containers += [c.name for c in pod.spec.init_containers]
-        result.append({'pod': pod.metadata.name, 'containers': containers})
-    return result
+    POD_REQUESTED_AT[namespace] = time.monotonic()
+    loading = POD_WATCHERS.get(namespace)
+    if loading is None:
+        loading = POD_WATCHERS[namespace] = asyncio.get_running_loop().run_in_executor(
+            None, start_pod_watch, namespace
+        )
+        loading.add_done_callback(functools.partial(forget_failed_listing, namespace))
+    # Shielded so a cancelled request doesn't cancel the listing shared with other requests
+    await asyncio.shield(loading)
+    with POD_CACHE_LOCK:
+        pods = list(POD_CACHE[namespace].values())
+    # Returning the response directly skips FastAPI's jsonable_encoder pass over the pods
+    return ORJSONResponse(pods)
 
 
 # --- Socket.IO Events ---
-def stream_logs(sid, room, namespace, pod, container):
-    """
-    Stream logs from a specific container in a Kubernetes pod and emit them via a WebSocket.
-    Uses asyncio.run_coroutine_threadsafe to emit logs from a thread.
-    """
-    main_loop = AppState.get_main_loop()
-    if os.getenv("TEST_MODE") == "true":
-        for i in range(10):  # Emit 10 fake log lines
-            asyncio.run_coroutine_threadsafe(
-                sio.emit('log', {
-                    'pod': pod,
-                    'container': container,
-                    'line': f"Fake log line {i} from {pod}/{container}",
-                    'room': room
-                }, room=room),
-                main_loop
-            )
-            time.sleep(1)  # Simulate log streaming delay
-        return
+class LogStream:  # pylint: disable=too-many-instance-attributes
+    """
+    State shared between the event loop and the worker thread reading a log stream:
+    the bounded queue that log lines are handed over through, and the handle to stop the stream.
+    """
 
-    w = watch.Watch()
+    def __init__(self, loop):
+        """
+        :param loop: The asyncio event loop consuming the log lines.
+        """
+        self.lines = asyncio.Queue(maxsize=LOG_QUEUE_SIZE)
+        self.dropped = 0
+        self.response = None
+        self.last_read_at = time.monotonic()
+        self.last_timestamp = None
+        self.last_timestamp_lines = 0
+        self.repeated_lines = 0
+        self._loop = loop
+        self._stopped = threading.Event()
+        self._pending_put = None
+
+    def put_lines(self, lines):
+        """
+        Queue log lines for the event loop. Called from the worker thread, with one
+        hand-off to the loop per call rather than per line. With LOG_OVERFLOW_BLOCK,
+        waits until the queue has room for the lines, so the apiserver connection
+        back-pressures instead of lines being dropped.
+        :param lines: The log lines to queue.
+        """
+        if not LOG_OVERFLOW_BLOCK:
+            self._loop.call_soon_threadsafe(self.put_nowait, lines)
+            return
+        self._pending_put = asyncio.run_coroutine_threadsafe(self._put(lines), self._loop)
+        if self.is_stopped():
+            self._pending_put.cancel()
+        try:
+            self._pending_put.result()
+        except CancelledError:
+            pass
+
+    async def _put(self, lines):
+        for line in lines:
+            await self.lines.put(line)
+
+    def put_nowait(self, lines):
+        """
+        Queue log lines from the event loop, dropping the oldest queued lines on overflow.
+        :param lines: The log lines to queue.
+        """
+        for line in lines:
+            if self.lines.full():
+                self.lines.get_nowait()
+                self.dropped += 1
+            self.lines.put_nowait(line)
+
+    def stop(self):
+        """
+        Ask the worker thread to stop, waking it up if it is blocked reading the log stream
+        or waiting for room in the queue.
+        """
+        self._stopped.set()
+        if self._pending_put is not None:
+            self._pending_put.cancel()
+        connection = self.response.connection if self.response is not None else None
+        if connection is not None and connection.sock is not None:
+            try:
+                # Closing the socket does not interrupt a blocked read, shutting it down does
+                connection.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def is_stopped(self):
+        """
+        :return: Whether the log stream has been stopped.
+        """
+        return self._stopped.is_set()
+
+    def wait(self, timeout):
+        """
+        Sleep for up to timeout seconds, returning early if the log stream is stopped.
+        :return: Whether the log stream has been stopped.
+        """
+        return self._stopped.wait(timeout)
+
+
+def log_timestamp(line):
+    """
+    Return the timestamp a log line is prefixed with, with its fraction padded to nanoseconds
+    so that timestamps compare in time order as strings.
+    :param line: A log line read with `timestamps=True`.
+    """
+    timestamp = line.partition(' ')[0]
+    zone = 19
+    if timestamp[19:20] == '.':
+        zone = 20
+        while zone < len(timestamp) and timestamp[zone].isdigit():
+            zone += 1
+    return f"{timestamp[:19]}.{timestamp[20:zone]:0<9}{timestamp[zone:]}"
+
+
+def queue_log_lines(stream, lines):
+    """
+    Queue timestamped log lines on the LogStream without their timestamps. Lines a reopened
+    log stream repeats are skipped: those older than the last line already queued, and as many
+    lines with its timestamp as were queued with it.
+    :param stream: The LogStream to queue the lines on.
+    :param lines: The log lines, as read with `timestamps=True`.
+    """
+    queued = []
+    for line in lines:
+        timestamp = log_timestamp(line)
+        if timestamp == stream.last_timestamp:
+            if stream.repeated_lines:
+                stream.repeated_lines -= 1
+                continue
+            stream.last_timestamp_lines += 1
+        elif stream.last_timestamp is not None and timestamp < stream.last_timestamp:
+            continue
+        else:
+            stream.last_timestamp = timestamp
+            stream.last_timestamp_lines = 1
+            stream.repeated_lines = 0
+        queued.append(line.partition(' ')[2])
+    if queued:
+        stream.put_lines(queued)
+
+
+def read_log_lines(resp, stream, deadline):
+    """
+    Split a raw log response into lines and queue them on the LogStream, until the
+    response ends, the stream is stopped, or the deadline has passed at the end of a line.
+    :param resp: The raw log response.
+    :param stream: The LogStream to queue the lines on.
+    :param deadline: The `time.monotonic()` after which the response should be reopened.
+    :return: Whether the deadline has passed.
+    """
+    # Each chunk is decoded whole; characters split across chunks are completed by the next one
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    # A reopened response starts with the lines already queued with the last timestamp again
+    stream.repeated_lines = stream.last_timestamp_lines
+    partial = ''
+    for chunk in resp.stream(LOG_CHUNK_SIZE):
+        if stream.is_stopped():
+            return False
+        stream.last_read_at = time.monotonic()
+        lines = (partial + decoder.decode(chunk)).split('\n')
+        partial = lines.pop()
+        queue_log_lines(stream, lines)
+        if not partial and stream.last_read_at > deadline:
+            return True
+    partial += decoder.decode(b'', final=True)
+    if partial:
+        queue_log_lines(stream, [partial])
+    return False
+
+
+def stream_fake_logs(namespace, pod, container, stream):
+    """
+    Stream fake log lines into the queue of a LogStream in test mode.
+    """
+    for i in range(10):  # Emit 10 fake log lines
+        stream.put_lines([f"Fake log line {i} from {pod}/{container}"])
+        if stream.wait(1):  # Simulate log streaming delay
+            break
+
+
+def stream_pod_logs(namespace, pod, container, stream):
+    """
+    Stream logs from a specific container in a Kubernetes pod into the queue of a LogStream.
+    The raw response is read by read_log_lines in this worker thread. Streaming ends
+    once the LogStream is stopped. If the connection drops, stays silent for LOG_READ_TIMEOUT
+    seconds, or has been open for LOG_STREAM_LIFETIME seconds, the stream is reopened
+    from the last line received.
+    """
+    delay = LOG_RECONNECT_MIN_DELAY
+    position = {'tail_lines': LOG_TAIL_LINES}
     try:
-        for line in w.stream(
-            v1.read_namespaced_pod_log,
-            name=pod,
-            namespace=namespace,
-            container=container,
-            follow=True,
-            tail_lines=100
-        ):
-            asyncio.run_coroutine_threadsafe(
-                sio.emit('log', {
-                    'pod': pod,
-                    'container': container,
-                    'line': line.strip(),
-                    'room': room
-                }, room=room),
-                main_loop
-            )
+        while not stream.is_stopped():
+            connected_at = time.monotonic()
+            try:
+                resp = stream.response = v1.read_namespaced_pod_log(
+                    name=pod,
+                    namespace=namespace,
+                    container=container,
+                    follow=True,
+                    timestamps=True,
+                    _preload_content=False,
+                    _request_timeout=(LOG_CONNECT_TIMEOUT, LOG_READ_TIMEOUT),
+                    **position
+                )
+                try:
+                    # A stop() before the response was assigned could not shut its socket down
+                    if stream.is_stopped():
+                        return
+                    expired = read_log_lines(resp, stream, connected_at + LOG_STREAM_LIFETIME)
+                finally:
+                    resp.close()
+                    resp.release_conn()
+                if not expired:
+                    return
+                delay = LOG_RECONNECT_MIN_DELAY
+            except ReadTimeoutError:
+                # Nothing was logged for a while; reopen the stream in case it went stale
+                delay = LOG_RECONNECT_MIN_DELAY
+            except HTTPError as e:
+                # Any transport failure, including TLS errors raised mid-read, drops the stream
+                if stream.is_stopped():
+                    return
+                print(f"Connection lost streaming logs for {pod}/{container}, "
+                      f"reconnecting in {delay}s: {e}")
+                if stream.wait(delay):
+                    return
+                # Back off further only while reconnecting doesn't get any log lines through
+                delay = (LOG_RECONNECT_MIN_DELAY if stream.last_read_at > connected_at
+                         else min(delay * 2, LOG_RECONNECT_MAX_DELAY))
+            # Resume after the last line received instead of replaying the tail; the lines
+            # repeated within the last second are skipped by their timestamps
+            position = {'since_seconds': math.ceil(time.monotonic() - stream.last_read_at)}
     except client.exceptions.ApiException as e:
         print(f"API error streaming logs for {pod}/{container}: {e}")
 
 
+stream_logs = stream_fake_logs if TEST_MODE else stream_pod_logs
+
+
+class LogViewer:
+    """
+    A log window viewing a shared log stream. Batches are sent to its socket one at a time,
+    the next one once the browser has acknowledged the previous one; lines arriving meanwhile
+    are held back, up to LOG_QUEUE_SIZE of them, so a slow browser only holds up its own window.
+    With LOG_OVERFLOW_BLOCK nothing is dropped: the window has room while a whole batch of
+    the stream still fits in its backlog.
+    """
+
+    def __init__(self, sid, room, pod, container):
+        """
+        :param sid: The Socket.IO session of the browser.
+        :param room: The room of the log window.
+        :param pod: The pod the log lines belong to.
+        :param container: The container the log lines belong to.
+        """
+        self.sid = sid
+        self.envelope = {'p': pod, 'c': container, 'r': room}
+        self.backlog = deque(maxlen=None if LOG_OVERFLOW_BLOCK else LOG_QUEUE_SIZE)
+        self.dropped = 0
+        self.sending = False
+        self.has_room = asyncio.Event()
+        self.has_room.set()
+
+    async def send(self, lines):
+        """
+        Send log lines to the browser, holding them back while a batch awaits its acknowledgement.
+        Once the backlog is full, the oldest lines are dropped, unless LOG_OVERFLOW_BLOCK.
+        :param lines: The log lines to send.
+        """
+        held = len(self.backlog)
+        self.backlog.extend(lines)
+        self.dropped += held + len(lines) - len(self.backlog)
+        self._update_room()
+        await self._send_batch()
+
+    def _update_room(self):
+        # A batch of the stream is up to LOG_BATCH_SIZE lines plus a dropped lines marker
+        if len(self.backlog) + LOG_BATCH_SIZE + 1 > LOG_QUEUE_SIZE:
+            self.has_room.clear()
+        else:
+            self.has_room.set()
+
+    async def _send_batch(self):
+        if self.sending or not (self.backlog or self.dropped):
+            return
+        batch = [self.backlog.popleft() for _ in range(min(len(self.backlog), LOG_BATCH_SIZE))]
+        if self.dropped:
+            batch.insert(0, f"... {self.dropped} log lines dropped, "
+                            f"the log window could not keep up ...")
+            self.dropped = 0
+        self._update_room()
+        self.sending = True
+        await sio.emit('log_batch', {**self.envelope, 'l': batch}, to=self.sid,
+                       callback=self._acknowledged)
+
+    async def _acknowledged(self, *_):
+        self.sending = False
+        await self._send_batch()
+
+    async def wait_for_room(self):
+        """
+        Wait until the backlog of the log window has room for a whole batch of the stream.
+        """
+        await self.has_room.wait()
+
+    def close(self):
+        """
+        Discard the held back lines once the log window stops viewing the stream.
+        """
+        self.backlog.clear()
+        self.dropped = 0
+        self.has_room.set()
+
+
+class StreamState:
+    """
+    A log stream followed once for a (namespace, pod, container) and fanned out to the
+    LogViewer of every log window viewing it, along with its most recent lines for
+    windows joining later.
+    """
+
+    def __init__(self, key, loop):
+        """
+        :param key: The (namespace, pod, container) the logs are streamed from.
+        :param loop: The asyncio event loop consuming the log lines.
+        """
+        self.key = key
+        self.viewers = {}
+        self.recent = deque(maxlen=LOG_TAIL_LINES)
+        self.stream = LogStream(loop)
+        self.task = None
+
+    async def subscribe(self, sid, room):
+        """
+        Add a log window to the windows viewing the stream, catching it up with the recent lines.
+        :param sid: The Socket.IO session of the browser.
+        :param room: The room of the log window.
+        """
+        _, pod, container = self.key
+        viewer = self.viewers[(sid, room)] = LogViewer(sid, room, pod, container)
+        if self.recent:
+            await viewer.send(list(self.recent))
+
+    def unsubscribe(self, sid, room):
+        """
+        Remove a log window from the windows viewing the stream, stopping the stream once
+        no window is left.
+        :param sid: The Socket.IO session of the browser.
+        :param room: The room of the log window.
+        :return: Whether the stream has been stopped.
+        """
+        viewer = self.viewers.pop((sid, room), None)
+        if viewer is not None:
+            viewer.close()
+        if self.viewers:
+            return False
+        self.task.cancel()
+        return True
+
+    async def publish(self, lines):
+        """
+        Send log lines to every log window viewing the stream. With LOG_OVERFLOW_BLOCK, first
+        waits until each of them has room for the lines, so the log stream is paused instead.
+        :param lines: The log lines to send.
+        """
+        self.recent.extend(lines)
+        viewers = list(self.viewers.values())
+        if LOG_OVERFLOW_BLOCK:
+            for viewer in viewers:
+                await viewer.wait_for_room()
+        for viewer in viewers:
+            await viewer.send(lines)
+
+
+async def emit_log_batches(state):
+    """
+    Drain the queued log lines of a StreamState and publish them to its log windows,
+    at most one batch every LOG_BATCH_INTERVAL seconds. Lines dropped on queue overflow
+    are reported by a marker line. Returns once None is dequeued.
+    """
+    stream = state.stream
+    lines = stream.lines
+    reported = 0
+    done = False
+    while not done:
+        batch = [await lines.get()]
+        while len(batch) < LOG_BATCH_SIZE and not lines.empty():
+            batch.append(lines.get_nowait())
+        # None is queued last, once the stream has ended
+        done = batch[-1] is None
+        if done:
+            batch.pop()
+        if stream.dropped > reported:
+            batch.insert(0, f"... {stream.dropped - reported} log lines dropped, "
+                            f"the dashboard could not keep up ...")
+            reported = stream.dropped
+        if batch:
+            await state.publish(batch)
+        if not done:
+            await asyncio.sleep(LOG_BATCH_INTERVAL)
+
+
+async def stream_logs_async(state):
+    """
+    Run stream_logs on the log stream executor once a slot in the bounded pool is free,
+    while emit_log_batches forwards its lines to the log windows of the StreamState.
+    Cancelling the task stops the LogStream, releasing the worker thread.
+    """
+    stream = state.stream
+    flusher = asyncio.create_task(emit_log_batches(state))
+    try:
+        async with LOG_STREAM_POOL:
+            await asyncio.get_running_loop().run_in_executor(
+                LOG_STREAM_EXECUTOR, stream_logs, *state.key, stream
+            )
+        # Let the flusher emit the remaining lines before it returns
+        await stream.lines.put(None)
+        await flusher
+    finally:
+        stream.stop()
+        flusher.cancel()
+        if LOG_STREAMS.get(state.key) is state:
+            del LOG_STREAMS[state.key]
+        for viewer in state.viewers:
+            if ROOM_STREAMS.get(viewer) is state:
+                del ROOM_STREAMS[viewer]
+
+
+def stop_stream(sid, room):
+    """
+    Unsubscribe a log window from its log stream, stopping the stream once no window is left.
+    :param sid: The Socket.IO session of the browser.
+    :param room: The room of the log window whose log stream should be stopped.
+    """
+    state = ROOM_STREAMS.pop((sid, room), None)
+    if state is None:
+        return
+    if state.unsubscribe(sid, room) and LOG_STREAMS.get(state.key) is state:
+        del LOG_STREAMS[state.key]
+
+
 @sio.event
 async def connect(sid, environ):
     """
@@ -278,8 +1059,10 @@ async def connect(sid, environ):
 @sio.event
 async def disconnect(sid):
     """
-    Handles client disconnection events.
+    Handles client disconnection events and stops the client's log streams.
     """
+    for room in sio.rooms(sid):
+        stop_stream(sid, room)
     print(f"Client disconnected: {sid}")
 
 
@@ -295,12 +1078,16 @@ async def start(sid, data):
     room = data.get('room')
     # Enter room from async context
     await sio.enter_room(sid, room)
-    # Start log streaming in a thread
-    threading.Thread(
-        target=stream_logs,
-        args=(sid, room, namespace, pod, container),
-        daemon=True
-    ).start()
+    # Subscribe the window to the container's log stream, replacing any stream it already had.
+    # Windows viewing the same container share one stream, run in the bounded pool.
+    stop_stream(sid, room)
+    key = (namespace, pod, container)
+    state = LOG_STREAMS.get(key)
+    if state is None:
+        state = LOG_STREAMS[key] = StreamState(key, AppState.get_main_loop())
+        state.task = asyncio.create_task(stream_logs_async(state))
+    ROOM_STREAMS[(sid, room)] = state
+    await state.subscribe(sid, room)
 
 
 @sio.event
@@ -309,6 +1096,7 @@ async def stop(sid, data):
     Handles the termination of a log streaming session for a specific container in a Kubernetes pod.
     """
     room = data.get('room')
+    stop_stream(sid, room)
     await sio.leave_room(sid, room)
 
 
@@ -323,4 +1111,15 @@ if __name__ == '__main__':
     )
     args = parser.parse_args()
     import uvicorn
-    uvicorn.run(kube_dash, host="0.0.0.0", port=args.port)
+    # A single worker: log streams, the pod cache and Socket.IO sessions live in this process.
+    # The event loop is uvloop where it is installed (it is not available on Windows).
+    uvicorn.run(
+        kube_dash,
+        host="0.0.0.0",
+        port=args.port,
+        workers=1,
+        loop="auto",
+        http="httptools",
+        ws="websockets",
+        ws_max_size=WS_MAX_SIZE
+    )
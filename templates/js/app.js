@@ -291,49 +291,58 @@ function renderLogs(windowId) {
   logsDiv.innerHTML = '';
   win.logs.forEach(log => {
     if (!search || log.line.toLowerCase().includes(search)) {
-      const div = document.createElement('div');
-      div.className = 'log-line';
-      div.innerHTML = `<span class="pod-label">[${log.pod}]</span>` +
-                      `<span class="container-label">[${log.container}]</span>` +
-                      `<span class="timestamp">${log.time}</span>` +
-                      log.line.replace(/</g, '&lt;').replace(/>/g, '&gt;');
-      logsDiv.appendChild(div);
+      logsDiv.appendChild(createLogLine(log));
     }
   });
   logsDiv.scrollTop = 0;
 }
 
+function createLogLine(log) {
+  const div = document.createElement('div');
+  div.className = 'log-line';
+  div.innerHTML = `<span class="pod-label">[${log.pod}]</span>` +
+                  `<span class="container-label">[${log.container}]</span>` +
+                  `<span class="timestamp">${log.time}</span>` +
+                  log.line.replace(/</g, '&lt;').replace(/>/g, '&gt;');
+  return div;
+}
+
 function getTime() {
   const now = new Date();
   return now.toLocaleTimeString();
 }
 
-socket.on('log', data => {
-  const windowId = Object.keys(logWindows).find(id => logWindows[id].room === data.room);
+// Batches carry their pod (p), container (c), room (r) and lines (l) under short keys
+function appendLogBatch(data) {
+  const windowId = Object.keys(logWindows).find(id => logWindows[id].room === data.r);
   if (!windowId) return;
 
   const win = logWindows[windowId];
-  // Check if the log belongs to the current pod and container
-  if (data.pod === win.pod && data.container === win.container) {
-    win.logs.unshift({
-      pod: data.pod,
-      container: data.container,
-      line: data.line,
-      time: getTime()
-    });
-
-    // Render the log immediately if there's no search filter
+  // Check if the logs belong to the current pod and container
+  if (data.p !== win.pod || data.c !== win.container) return;
+
+  const time = getTime();
+  // Newest lines are shown first, so each line of the batch goes on top of the previous one
+  const fragment = document.createDocumentFragment();
+  data.l.forEach(line => {
+    const log = { pod: data.p, container: data.c, line: line, time: time };
+    win.logs.unshift(log);
     if (!win.search) {
-      const div = document.createElement('div');
-      div.className = 'log-line';
-      div.innerHTML = `<span class="pod-label">[${data.pod}]</span>` +
-                      `<span class="container-label">[${data.container}]</span>` +
-                      `<span class="timestamp">${getTime()}</span>` +
-                      data.line.replace(/</g, '&lt;').replace(/>/g, '&gt;');
-      win.logsDiv.insertBefore(div, win.logsDiv.firstChild);
-      win.logsDiv.scrollTop = 0;
-    } else {
-      renderLogs(windowId);
+      fragment.insertBefore(createLogLine(log), fragment.firstChild);
     }
+  });
+
+  // Render the batch immediately if there's no search filter
+  if (!win.search) {
+    win.logsDiv.insertBefore(fragment, win.logsDiv.firstChild);
+    win.logsDiv.scrollTop = 0;
+  } else {
+    renderLogs(windowId);
   }
+}
+
+// The server sends the next batch for a window once this one has been acknowledged
+socket.on('log_batch', (data, ack) => {
+  appendLogBatch(data);
+  ack();
 });